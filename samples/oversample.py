@@ -83,7 +83,9 @@ if __name__ == "__main__":
 
     main(input_file, output_file, upsample_factor)
     print(f"Oversampled audio saved to {output_file} with upsample factor {upsample_factor}.")
-    print(f"Original sample rate: {sf.info(input_file).samplerate}, New sample rate: {sf.info(output_file).samplerate}")
-    print(f"Original duration: {sf.info(input_file).duration} seconds, New duration: {sf.info(output_file).duration} seconds")
-    print(f"Original number of samples: {sf.info(input_file).frames}, New number of samples: {sf.info(output_file).frames}")
+    src_info = sf.info(input_file)
+    dst_info = sf.info(output_file)
+    print(f"Original sample rate: {src_info.samplerate}, New sample rate: {dst_info.samplerate}")
+    print(f"Original duration: {src_info.duration} seconds, New duration: {dst_info.duration} seconds")
+    print(f"Original number of samples: {src_info.frames}, New number of samples: {dst_info.frames}")
         
\ No newline at end of file
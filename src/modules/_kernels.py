@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: _kernels.py
+Author: Thimira Hirushan
+Date: 2025-07-10
+Description: This module provides Numba-compiled signal processing kernels used by the processing modules.
+Version: 1.0
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Number of samples between exact re-seeds of the carrier recurrence, bounding roundoff growth.
+CARRIER_RESYNC = 4096
+
+@njit(cache=True)
+def am_modulate(x, omega, out):
+    """
+    Multiply a signal by a cosine carrier generated with a second-order recurrence.
+
+    The carrier follows c[n + 1] = 2 * cos(omega) * c[n] - c[n - 1], which needs no
+    transcendental per sample. The recurrence is re-seeded every CARRIER_RESYNC samples.
+
+    Args:
+        x (np.ndarray): 1-D modulating signal.
+        omega (float): Carrier angular frequency in radians per sample.
+        out (np.ndarray): 1-D output buffer, same length as x.
+
+    Returns:
+        np.ndarray: The output buffer holding the modulated signal.
+    """
+    k = 2.0 * np.cos(omega)
+    num_samples = x.shape[0]
+    for start in range(0, num_samples, CARRIER_RESYNC):
+        stop = min(start + CARRIER_RESYNC, num_samples)
+        c_prev = np.cos(omega * (start - 1))
+        c = np.cos(omega * start)
+        for n in range(start, stop):
+            out[n] = x[n] * c
+            c_next = k * c - c_prev
+            c_prev = c
+            c = c_next
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def fused_preemph_am(x, alpha, omega, scale, out):
+    """
+    Apply scaling, pre-emphasis and amplitude modulation in a single pass over the signal.
+
+    Computes out[n] = scale * (x[n] - alpha * x[n - 1]) * cos(omega * n) without materialising
+    the pre-emphasized signal. Blocks of CARRIER_RESYNC samples run in parallel, each
+    seeding its own carrier recurrence from exact cosines at the block start.
+
+    Args:
+        x (np.ndarray): 1-D input signal.
+        alpha (float): Pre-emphasis coefficient.
+        omega (float): Carrier angular frequency in radians per sample.
+        scale (float): Gain applied to the emphasized signal, e.g. 1 / max(|x|) to normalize.
+        out (np.ndarray): 1-D output buffer, same length as x.
+
+    Returns:
+        np.ndarray: The output buffer holding the emphasized, modulated signal.
+    """
+    k = 2.0 * np.cos(omega)
+    num_samples = x.shape[0]
+    num_blocks = (num_samples + CARRIER_RESYNC - 1) // CARRIER_RESYNC
+    for block in prange(num_blocks):
+        start = block * CARRIER_RESYNC
+        stop = min(start + CARRIER_RESYNC, num_samples)
+        c_prev = np.cos(omega * (start - 1))
+        c = np.cos(omega * start)
+        for n in range(start, stop):
+            if n == 0:
+                emphasized = x[0]
+            else:
+                emphasized = x[n] - alpha * x[n - 1]
+            out[n] = emphasized * scale * c
+            c_next = k * c - c_prev
+            c_prev = c
+            c = c_next
+    return out
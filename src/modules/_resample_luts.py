@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: _resample_luts.py
+Author: Thimira Hirushan
+Date: 2025-07-14
+Description: This module designs the polyphase resampling filters and loads the precomputed
+             filter taps shipped for the common sample-rate ratios.
+Version: 1.0
+"""
+
+import os
+import numpy as np
+import scipy.signal
+
+# Kaiser window shape parameter for the polyphase anti-imaging filter
+KAISER_BETA = 5.0
+
+# Common (up, down) ratios: 5x oversampling, 44.1k->48k, 48k->192k, 44.1k->96k and 44.1k->192k
+LUT_RATIOS = [(5, 1), (160, 147), (4, 1), (320, 147), (640, 147)]
+
+LUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luts')
+
+def design_kaiser(up, down):
+    """
+    Design the Kaiser-windowed sinc low-pass filter for an up/down resampling ratio.
+
+    Args:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        np.ndarray: Filter taps (float32), scaled by the upsampling factor.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = scipy.signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', KAISER_BETA))
+    return (taps * up).astype(np.float32)
+
+def lut_path(up, down):
+    """
+    Return the path of the precomputed filter taps for an up/down ratio.
+
+    Args:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        str: Path to the .npy file.
+    """
+    return os.path.join(LUT_DIR, f'kaiser_{up}_{down}.npy')
+
+def _load_luts():
+    """
+    Load the precomputed filter taps that are present on disk.
+
+    Returns:
+        dict: Filter taps keyed by (up, down).
+    """
+    luts = {}
+    for up, down in LUT_RATIOS:
+        path = lut_path(up, down)
+        if os.path.exists(path):
+            luts[(up, down)] = np.load(path)
+    return luts
+
+LUTS = _load_luts()
+
+if __name__ == "__main__":
+    """
+    # Regenerate the shipped filter taps, e.g. after changing KAISER_BETA or LUT_RATIOS.
+    """
+
+    os.makedirs(LUT_DIR, exist_ok=True)
+    for up, down in LUT_RATIOS:
+        np.save(lut_path(up, down), design_kaiser(up, down))
+        print(f"Saved {lut_path(up, down)}")
@@ -10,6 +10,7 @@ Version: 1.0
 """
 
 import numpy as np
+from ._kernels import am_modulate
 
 class AmModulator:
     """
@@ -41,9 +42,12 @@ class AmModulator:
         Returns:
             np.ndarray: The modulated audio signal.
         """
-        t = np.arange(len(self.modulating_signal)) / self.sample_rate
-        carrier_wave = np.cos(2 * np.pi * self.carrier_freq * t)
-        return self.modulating_signal * carrier_wave
+        signal = np.ascontiguousarray(self.modulating_signal)
+        omega = 2 * np.pi * self.carrier_freq / self.sample_rate
+        # The carrier is generated on the fly inside the kernel, so it is never materialised.
+        modulated = np.empty(signal.shape, dtype=np.result_type(signal.dtype, np.float32))
+        am_modulate(signal.reshape(-1), omega, modulated.reshape(-1))
+        return modulated
     
     def set_carrier_freq(self, carrier_freq):
         """
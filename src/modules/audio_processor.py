@@ -10,9 +10,153 @@ Description: A module for processing audio files, including loading, pre-emphasi
 """
 
 import os
+from fractions import Fraction
+from functools import lru_cache
 import numpy as np
+import scipy.signal
 from scipy.io import wavfile
-import pydub
+import av
+import soundfile as sf
+from ._kernels import fused_preemph_am
+from ._resample_luts import KAISER_BETA, LUTS, design_kaiser
+
+# Optional GPU resampling through CuPy; used only when a CUDA device is present
+try:
+    import cupy as cp
+    from cupyx.scipy.signal import resample_poly as _gpu_resample_poly
+except ImportError:
+    cp = None
+
+# Minimum input length for the GPU path, so host/device transfers are amortized
+GPU_RESAMPLE_THRESHOLD = 1 << 24
+
+# Output samples produced per upfirdn call, keeping the working set cache-sized
+RESAMPLE_BLOCK_SIZE = 1 << 18
+
+# Samples converted and written per chunk when saving audio files
+WRITE_BLOCK_SIZE = 1 << 20
+
+# Polyphase filter taps keyed by (up, down); the design only depends on the ratio
+_FILTER_CACHE = {}
+
+def _polyphase_filter(up, down):
+    """
+    Return the polyphase low-pass filter for an up/down resampling ratio.
+
+    Common ratios come from the precomputed lookup tables; other ratios are designed
+    on first use and cached.
+
+    Args:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        np.ndarray: Filter taps (float32), scaled by the upsampling factor.
+    """
+    taps = LUTS.get((up, down))
+    if taps is None:
+        taps = _FILTER_CACHE.get((up, down))
+    if taps is None:
+        taps = design_kaiser(up, down)
+        _FILTER_CACHE[(up, down)] = taps
+    return taps
+
+def _polyphase_resample(samples, up, down):
+    """
+    Resample a 1-D signal by up/down with a polyphase FIR filter.
+
+    The output is produced in blocks of RESAMPLE_BLOCK_SIZE samples, each filtered from
+    the input span that contributes to it (including the filter overlap), so temporary
+    buffers stay bounded regardless of the signal length.
+
+    Args:
+        samples (np.ndarray): 1-D input signal.
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        np.ndarray: The resampled signal, with ceil(len(samples) * up / down) samples.
+    """
+    if up == down:
+        return samples.copy()
+    taps = _polyphase_filter(up, down)
+    half_len = (len(taps) - 1) // 2
+    num_out = -(-len(samples) * up // down)
+    # Zero-pad the filter front so the output is centred on the input samples
+    pre_pad = down - half_len % down
+    pre_remove = (half_len + pre_pad) // down
+    taps = np.concatenate((np.zeros(pre_pad, dtype=taps.dtype), taps))
+    num_in = len(samples)
+    resampled = np.zeros(num_out, dtype=np.result_type(samples.dtype, taps.dtype))
+    for start in range(0, num_out, RESAMPLE_BLOCK_SIZE):
+        stop = min(start + RESAMPLE_BLOCK_SIZE, num_out)
+        # Input span feeding outputs [start, stop); the first index is aligned to a
+        # multiple of down so the block lands on the same output phase as a full pass.
+        first = max(0, ((start + pre_remove) * down - len(taps) + 1) // up)
+        first -= first % down
+        last = min(num_in, (stop - 1 + pre_remove) * down // up + 1)
+        block = scipy.signal.upfirdn(taps, samples[first:last], up, down)
+        offset = start + pre_remove - first * up // down
+        block = block[offset:offset + stop - start]
+        resampled[start:start + len(block)] = block
+    return resampled
+
+@lru_cache(maxsize=None)
+def _has_gpu():
+    """
+    Check once, on first use, whether CuPy can see a CUDA device.
+
+    The device query starts the CUDA runtime, so it is deferred until a signal long
+    enough for the GPU path is actually resampled.
+
+    Returns:
+        bool: True if CuPy is installed and at least one CUDA device is available.
+    """
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except RuntimeError:
+        return False
+
+def _gpu_resample(samples, up, down):
+    """
+    Resample a 1-D signal by up/down on the GPU with CuPy.
+
+    The filter uses the same Kaiser window design as _polyphase_resample.
+
+    Args:
+        samples (np.ndarray): 1-D input signal.
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+
+    Returns:
+        np.ndarray: The resampled signal, or None if the GPU ran out of memory or
+        failed, so the caller can fall back to the CPU path.
+    """
+    try:
+        resampled = _gpu_resample_poly(cp.asarray(samples), up, down, window=('kaiser', KAISER_BETA))
+        return cp.asnumpy(resampled)
+    except (MemoryError, RuntimeError):
+        # cupy.cuda.memory.OutOfMemoryError and CUDA runtime errors derive from these
+        return None
+
+def _mp3_sample_rate(sample_rate):
+    """
+    Pick the sample rate to encode MP3 at, since the codec only supports up to 48 kHz.
+
+    Args:
+        sample_rate (int): Sample rate of the audio data in Hz.
+
+    Returns:
+        int: sample_rate if libmp3lame supports it, else the highest supported rate below
+        it (or the lowest supported rate if there is none).
+    """
+    supported = av.codec.Codec('libmp3lame', 'w').audio_rates
+    if sample_rate in supported:
+        return sample_rate
+    lower = [rate for rate in supported if rate < sample_rate]
+    return max(lower) if lower else min(supported)
 
 class AudioProcessor:
     def __init__(self, file_path):
@@ -23,11 +167,20 @@ class AudioProcessor:
         self.sample_rate = None
         self.audio_data = None
         self.file_format = None
+        # True once the data is at unit scale ([-1, 1] reference), False while it is at int16 scale.
+        # Later stages keep the scale even if they push individual peaks above 1.
+        self.unit_scale = False
+        # True only while the data peak is exactly 1, i.e. right after normalization;
+        # every stage that changes the waveform clears it
+        self.normalized = False
     
     def load_audio(self, file_path):
         """
         Load an audio file and store its sample rate and data.
 
+        Both formats yield samples at int16 scale: WAV data is kept as read and decoded
+        MP3 data is scaled to the int16 range.
+
         Args:
             file_path (str): Path to the audio file.
         """
@@ -35,13 +188,32 @@ class AudioProcessor:
             raise FileNotFoundError(f"Audio file {file_path} does not exist.")
 
         self.file_path = file_path
+        self.unit_scale = False
+        self.normalized = False
         if file_path.lower().endswith('.wav'):
+            # Read the whole data chunk in one buffered call rather than sample by sample
             self.sample_rate, self.audio_data = wavfile.read(file_path)
             self.file_format = 'wav'
         elif file_path.lower().endswith('.mp3'):
-            audio = pydub.AudioSegment.from_mp3(file_path)
-            self.sample_rate = audio.frame_rate
-            self.audio_data = np.array(audio.get_array_of_samples())
+            # Decode in-process with libav and collect the frames as (channels, samples) arrays
+            chunks = []
+            with av.open(file_path) as container:
+                stream = container.streams.audio[0]
+                for frame in container.decode(stream):
+                    samples = frame.to_ndarray()
+                    if not frame.format.is_planar:
+                        samples = samples.reshape(-1, len(frame.layout.channels)).T
+                    chunks.append(samples)
+                self.sample_rate = stream.codec_context.sample_rate
+            if not chunks:
+                raise ValueError(f"Audio file {file_path} contains no audio frames.")
+            # Average the channels down to mono, at the same int16 scale as WAV input
+            samples = np.concatenate(chunks, axis=1)
+            self.audio_data = samples.mean(axis=0, dtype=np.float32)
+            if np.issubdtype(samples.dtype, np.floating):
+                self.audio_data *= np.float32(32767)
+            elif samples.dtype != np.int16:
+                self.audio_data *= np.float32(32767 / np.iinfo(samples.dtype).max)
             self.file_format = 'mp3'
         else:
             raise ValueError("Unsupported audio format. Only WAV and MP3 are supported.")
@@ -55,12 +227,10 @@ class AudioProcessor:
         if self.audio_data.ndim == 0:
             raise ValueError("Audio data is not valid. Ensure the audio file is loaded correctly.")
         if self.audio_data.ndim > 1:
-            self.audio_data = np.mean(self.audio_data, axis=1)
-        self.audio_data = self.audio_data.astype(np.float32)
-        if self.audio_data.ndim == 1:
-            self.audio_data = self.audio_data.reshape(-1, 1)
-        else:
+            self.audio_data = np.mean(self.audio_data, axis=1, dtype=np.float32)
+        if self.audio_data.ndim != 1:
             raise ValueError("Audio data is not in a valid format for monotone conversion.")
+        self.audio_data = self.audio_data.astype(np.float32, copy=False)
 
     def normalize_data(self):
         """
@@ -68,33 +238,100 @@ class AudioProcessor:
         """
         if self.audio_data is None:
             raise ValueError("Audio data is not loaded. Please load an audio file first.")
+        if self.audio_data.ndim != 1:
+            raise ValueError("Audio data is not in a valid format for normalization.")
+        # Convert before taking the peak: np.abs overflows on int16 -32768.
+        # Only non-float32 data needs a float32 working copy; it is then scaled in place.
+        if self.audio_data.dtype != np.float32:
+            self.audio_data = self.audio_data.astype(np.float32)
         max_val = np.max(np.abs(self.audio_data))
         if max_val == 0:
             raise ValueError("Audio data cannot be normalized because it contains only zeros.")
-        self.audio_data = self.audio_data / max_val
-        self.audio_data = self.audio_data.astype(np.float32)
-        if self.audio_data.ndim == 1:
-            self.audio_data = self.audio_data.reshape(-1, 1)
-        else:
-            raise ValueError("Audio data is not in a valid format for normalization.")
+        np.multiply(self.audio_data, np.float32(1.0 / max_val), out=self.audio_data)
+        self.unit_scale = True
+        self.normalized = True
 
-    def pre_emphasize(self, alpha=0.97):
+    def pre_emphasize(self, alpha=0.97, carrier_freq=None, normalize=False):
         """
         Apply pre-emphasis to the audio data.
 
+        When a carrier frequency is given, the emphasized signal is also amplitude
+        modulated at the current sample rate in the same pass, so this should only be
+        used once the data is at its output sample rate.
+
+        With normalize=True the output is scaled by 1 / max(|x|) as it is written, which
+        replaces a separate normalize_data() call. Data that is already peak-normalized is
+        not scaled again. The emphasized output can peak above 1, so the normalized flag is
+        cleared afterwards while the data stays at unit scale.
+
         Args:
             alpha (float): Pre-emphasis coefficient, typically between 0.95 and 0.99.
+            carrier_freq (float, optional): Carrier frequency in Hz for fused AM modulation.
+            normalize (bool): Normalize the input peak to 1 while applying pre-emphasis.
         """
         if self.audio_data is None:
             raise ValueError("Audio data is not loaded. Please load an audio file first.")
         if self.audio_data.ndim != 1:
             raise ValueError("Pre-emphasis can only be applied to mono audio data.")
-        self.audio_data = np.append(self.audio_data[0], self.audio_data[1:] - alpha * self.audio_data[:-1])
-        self.audio_data = self.audio_data.astype(np.float32)
-        if self.audio_data.ndim == 1:
-            self.audio_data = self.audio_data.reshape(-1, 1)
+        samples = self.audio_data
+        if not np.issubdtype(samples.dtype, np.floating):
+            samples = samples.astype(np.float32)
+        scale = 1.0
+        if normalize and not self.normalized:
+            max_val = np.max(np.abs(samples))
+            if max_val == 0:
+                raise ValueError("Audio data cannot be normalized because it contains only zeros.")
+            scale = 1.0 / max_val
+        # Cast alpha to the sample dtype so the scaled term does not upcast.
+        alpha = samples.dtype.type(alpha)
+        emphasized = np.empty_like(samples)
+        if carrier_freq is None:
+            emphasized[0] = samples[0]
+            np.subtract(samples[1:], alpha * samples[:-1], out=emphasized[1:])
+            if scale != 1.0:
+                emphasized *= samples.dtype.type(scale)
         else:
-            raise ValueError("Audio data is not in a valid format for pre-emphasis.")
+            if self.sample_rate is None:
+                raise ValueError("Sample rate is not set. Please load an audio file first.")
+            omega = 2 * np.pi * carrier_freq / self.sample_rate
+            fused_preemph_am(np.ascontiguousarray(samples), alpha, omega, scale, emphasized)
+        self.audio_data = emphasized.astype(np.float32, copy=False)
+        # Pre-emphasis can push the peak up to about 1 + alpha, so the data is no longer
+        # peak-normalized, but it keeps the unit scale it had (or was just given)
+        self.unit_scale = self.unit_scale or normalize
+        self.normalized = False
+
+    def process_fused(self, alpha, carrier_freq):
+        """
+        Normalize, pre-emphasize and amplitude modulate the audio data in one pass.
+
+        Equivalent to normalize_data() followed by pre_emphasize(alpha, carrier_freq), but
+        only the peak search and a single fused kernel sweep the signal. The carrier is
+        generated at the current sample rate, so call this after oversampling.
+
+        Args:
+            alpha (float): Pre-emphasis coefficient, typically between 0.95 and 0.99.
+            carrier_freq (float): Carrier frequency in Hz.
+        """
+        if self.audio_data is None:
+            raise ValueError("Audio data is not loaded. Please load an audio file first.")
+        if self.sample_rate is None:
+            raise ValueError("Sample rate is not set. Please load an audio file first.")
+        if self.audio_data.ndim != 1:
+            raise ValueError("Fused processing can only be applied to mono audio data.")
+        samples = np.ascontiguousarray(self.audio_data)
+        if not np.issubdtype(samples.dtype, np.floating):
+            samples = samples.astype(np.float32)
+        max_val = np.max(np.abs(samples))
+        if max_val == 0:
+            raise ValueError("Audio data cannot be normalized because it contains only zeros.")
+        omega = 2 * np.pi * carrier_freq / self.sample_rate
+        processed = np.empty(samples.shape, dtype=np.float32)
+        fused_preemph_am(samples, samples.dtype.type(alpha), omega, 1.0 / max_val, processed)
+        self.audio_data = processed
+        # The normalized input is pre-emphasized, so the output peak can exceed 1
+        self.unit_scale = True
+        self.normalized = False
 
     def oversample(self, output_frequency):
         """
@@ -107,38 +344,87 @@ class AudioProcessor:
             raise ValueError("Audio data is not loaded. Please load an audio file first.")
         if self.sample_rate is None:
             raise ValueError("Sample rate is not set. Please load an audio file first.")
+        if self.audio_data.ndim != 1:
+            raise ValueError("Oversampling can only be applied to mono audio data.")
         
         factor = output_frequency / self.sample_rate
         if factor < 1:
             raise ValueError("Output frequency must be greater than the original sample rate.")
         
-        num_samples = int(len(self.audio_data) * factor)
-        oversampled_data = np.interp(np.linspace(0, len(self.audio_data), num_samples), 
-                                      np.arange(len(self.audio_data)), 
-                                      self.audio_data[:, 0])
-        self.audio_data = oversampled_data.reshape(-1, 1)
+        if not (float(output_frequency).is_integer() and float(self.sample_rate).is_integer()):
+            raise ValueError("Sample rates must be whole numbers of Hz for polyphase resampling.")
+        output_frequency = int(output_frequency)
+        
+        # Polyphase resampling by the reduced ratio output/input rate
+        ratio = Fraction(output_frequency, int(self.sample_rate)).limit_denominator(1000)
+        up, down = ratio.numerator, ratio.denominator
+        samples = self.audio_data.astype(np.float32, copy=False)
+        oversampled_data = None
+        if len(samples) > GPU_RESAMPLE_THRESHOLD and _has_gpu():
+            oversampled_data = _gpu_resample(samples, up, down)
+        if oversampled_data is None:
+            oversampled_data = _polyphase_resample(samples, up, down)
+        self.audio_data = oversampled_data
         self.sample_rate = output_frequency
+        # Filter overshoot can push the peak slightly above 1; the scale is unchanged
+        self.normalized = False
 
     def save_audio(self, output_path):
         """
         Save the processed audio data to a file.
 
+        Data at unit scale (see unit_scale) is clipped to [-1, 1] and scaled to the int16
+        range; data at int16 scale is only rounded and clipped. Both formats keep the
+        channel layout of the data (MP3 supports mono and stereo). MP3 output is resampled
+        to at most 48 kHz, the highest rate the codec supports.
+
         Args:
             output_path (str): Path to save the processed audio file.
         """
         if self.audio_data is None:
             raise ValueError("Audio data is not loaded. Please load an audio file first.")
         
+        unit_scale = self.unit_scale
         if output_path.lower().endswith('.wav'):
-            wavfile.write(output_path, self.sample_rate, self.audio_data.astype(np.int16))
+            channels = 1 if self.audio_data.ndim == 1 else self.audio_data.shape[1]
+            # Convert and write in chunks so only one block of int16 samples exists at a time
+            with sf.SoundFile(output_path, 'w', samplerate=self.sample_rate, channels=channels,
+                              subtype='PCM_16') as file:
+                for start in range(0, len(self.audio_data), WRITE_BLOCK_SIZE):
+                    chunk = self.audio_data[start:start + WRITE_BLOCK_SIZE]
+                    if unit_scale:
+                        chunk = np.rint(np.clip(chunk, -1.0, 1.0) * 32767)
+                    elif np.issubdtype(chunk.dtype, np.floating):
+                        chunk = np.rint(chunk)
+                    file.write(np.clip(chunk, -32768, 32767).astype(np.int16))
         elif output_path.lower().endswith('.mp3'):
-            audio_segment = pydub.AudioSegment(
-                self.audio_data.tobytes(),
-                frame_rate=self.sample_rate,
-                sample_width=self.audio_data.dtype.itemsize,
-                channels=1
-            )
-            audio_segment.export(output_path, format='mp3')
+            channels = 1 if self.audio_data.ndim == 1 else self.audio_data.shape[1]
+            if self.audio_data.ndim > 2 or channels > 2:
+                raise ValueError("MP3 output supports only mono or stereo audio data.")
+            layout = 'mono' if channels == 1 else 'stereo'
+            mp3_rate = _mp3_sample_rate(int(self.sample_rate))
+            # Encode in-process with libmp3lame, feeding float frames in [-1, 1] through a
+            # resampler that converts them to a rate the codec supports
+            resampler = av.AudioResampler(format='fltp', layout=layout, rate=mp3_rate)
+            with av.open(output_path, 'w') as container:
+                stream = container.add_stream('libmp3lame', rate=mp3_rate, layout=layout)
+                for start in range(0, len(self.audio_data), WRITE_BLOCK_SIZE):
+                    chunk = self.audio_data[start:start + WRITE_BLOCK_SIZE]
+                    if unit_scale:
+                        chunk = np.clip(chunk, -1.0, 1.0)
+                    elif np.issubdtype(chunk.dtype, np.floating):
+                        chunk = np.clip(chunk / 32767, -1.0, 1.0)
+                    else:
+                        chunk = chunk / np.iinfo(chunk.dtype).max
+                    # Planar frames are laid out as (channels, samples)
+                    planes = np.ascontiguousarray(chunk.astype(np.float32).reshape(len(chunk), -1).T)
+                    frame = av.AudioFrame.from_ndarray(planes, format='fltp', layout=layout)
+                    frame.sample_rate = self.sample_rate
+                    for resampled in resampler.resample(frame):
+                        container.mux(stream.encode(resampled))
+                for resampled in resampler.resample(None):
+                    container.mux(stream.encode(resampled))
+                container.mux(stream.encode(None))
         else:
             raise ValueError("Unsupported output format. Only WAV and MP3 are supported.")
 #         """
\ No newline at end of file
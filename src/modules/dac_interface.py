@@ -31,14 +31,59 @@ class DacInterface:
         """
         self.sample_rate = sample_rate
         self.device = device  # ALSA device name or index
+        self._stream = None
 
     def output_audio(self, audio_data):
         """
         Output audio data to the DAC.
 
+        The output stream is opened on the first call and kept open, so consecutive
+        chunks are written to the same device without reopening it. The stream is
+        reopened only if sample_rate or the channel count changes between calls.
+
+        Unlike sd.play() followed by sd.wait(), this returns once the data has been
+        queued on the stream, not when playback ends. Call close(), or use the
+        interface as a context manager, to wait for the last buffer to finish playing.
+
         Args:
-            audio_data (numpy.ndarray): Audio data to be sent to the DAC (float32, -1.0 to 1.0).
+            audio_data (numpy.ndarray): Audio data to be sent to the DAC (float32, -1.0 to 1.0),
+                either 1-D mono or shaped (frames, channels).
+        """
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+        if audio_data.ndim == 1:
+            audio_data = audio_data.reshape(-1, 1)
+        elif audio_data.ndim != 2:
+            raise ValueError("Audio data must be 1-D or shaped (frames, channels).")
+        channels = audio_data.shape[1]
+        if self._stream is not None and (self._stream.samplerate != self.sample_rate
+                                         or self._stream.channels != channels):
+            self.close()
+        if self._stream is None:
+            self._stream = sd.OutputStream(samplerate=self.sample_rate, device=self.device,
+                                           channels=channels, dtype='float32')
+            self._stream.start()
+        self._stream.write(audio_data)
+
+    def close(self):
+        """
+        Stop and close the output stream, waiting for pending audio to finish playing.
         """
-        sd.play(audio_data, samplerate=self.sample_rate, device=self.device)
-        sd.wait()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
 
+    def __enter__(self):
+        """
+        Enter a context in which the output stream is closed on exit.
+
+        Returns:
+            DacInterface: This interface.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the output stream on leaving the context, letting pending audio finish playing.
+        """
+        self.close()
@@ -10,8 +10,15 @@ Version: 1.0
 """
 
 import os
+from contextlib import contextmanager
 import yaml
 
+# Prefer the LibYAML-backed loader/dumper, falling back to the pure-Python ones
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 class ConfigManager:
     """
     A class to manage configuration settings stored in a YAML file.
@@ -22,6 +29,7 @@ class ConfigManager:
 
     Methods:
         save(): Save the current configuration to the YAML file.
+        batch(): Context manager that defers saving until the block exits.
         update(new_settings): Update the configuration with new settings and save.
         get(key, default=None): Retrieve a value for a given key.
         set(key, value): Set a value for a given key and save.
@@ -40,6 +48,8 @@ class ConfigManager:
         """
         self.config_file = config_file
         self.config = self._load()
+        self._batch_depth = 0
+        self._dirty = False
 
     def _load(self):
         """
@@ -51,7 +61,7 @@ class ConfigManager:
         if not os.path.exists(self.config_file):
             return {}
         with open(self.config_file, 'r') as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=_YamlLoader)
             return config if config else {}
 
     def save(self):
@@ -59,7 +69,35 @@ class ConfigManager:
         Save the current configuration to the YAML file.
         """
         with open(self.config_file, 'w') as file:
-            yaml.safe_dump(self.config, file, default_flow_style=False)
+            yaml.dump(self.config, file, Dumper=_YamlDumper, default_flow_style=False)
+        self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer saving while several settings are changed, then save once on exit.
+
+        Example:
+            with config.batch():
+                config.set('a', 1)
+                config.set('b', 2)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.save()
+
+    def _changed(self):
+        """
+        Save after a mutation, or mark the configuration dirty inside a batch.
+        """
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save()
 
     def update(self, new_settings):
         """
@@ -69,7 +107,7 @@ class ConfigManager:
             new_settings (dict): Dictionary of settings to update.
         """
         self.config.update(new_settings)
-        self.save()
+        self._changed()
 
     def get(self, key, default=None):
         """
@@ -93,7 +131,7 @@ class ConfigManager:
             value: The value to set.
         """
         self.config[key] = value
-        self.save()
+        self._changed()
 
     def delete(self, key):
         """
@@ -104,7 +142,7 @@ class ConfigManager:
         """
         if key in self.config:
             del self.config[key]
-            self.save()
+            self._changed()
 
     def keys(self):
         """
@@ -120,7 +158,7 @@ class ConfigManager:
         Clear all configuration settings and save.
         """
         self.config = {}
-        self.save()
+        self._changed()
 
     def exists(self):
         """
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: test_am_modulator.py
+Author: Thimira Hirushan
+Date: 2025-07-21
+Description: Tests for the AmModulator class and its recursive carrier kernel.
+Version: 1.0
+"""
+
+import numpy as np
+import pytest
+
+from src.modules._kernels import CARRIER_RESYNC, am_modulate
+from src.modules.am_modulator import AmModulator
+
+def _reference(signal, carrier_freq, sample_rate):
+    """
+    Modulate with an explicitly evaluated cosine carrier.
+    """
+    t = np.arange(len(signal)) / sample_rate
+    return signal * np.cos(2 * np.pi * carrier_freq * t)
+
+@pytest.mark.parametrize('carrier_freq, sample_rate', [(40000, 192000), (1000, 44100), (19000, 48000)])
+def test_am_modulate_matches_cosine_across_resync_blocks(carrier_freq, sample_rate):
+    signal = np.random.default_rng(0).standard_normal(5 * CARRIER_RESYNC + 17)
+    omega = 2 * np.pi * carrier_freq / sample_rate
+    out = np.empty_like(signal)
+    am_modulate(signal, omega, out)
+    np.testing.assert_allclose(out, _reference(signal, carrier_freq, sample_rate), atol=1e-9)
+
+def test_modulate_keeps_float32_and_shape():
+    signal = np.random.default_rng(1).uniform(-1, 1, 2 * CARRIER_RESYNC + 3).astype(np.float32)
+    modulator = AmModulator(40000, signal, 192000)
+    modulated = modulator.modulate()
+    assert modulated.dtype == np.float32
+    assert modulated.shape == signal.shape
+    np.testing.assert_allclose(modulated, _reference(signal, 40000, 192000), atol=1e-6)
+
+def test_setters_take_effect_on_next_modulation():
+    signal = np.ones(1000)
+    modulator = AmModulator(40000, signal, 192000)
+    modulator.set_carrier_freq(10000)
+    modulator.set_sample_rate(48000)
+    modulator.set_modulating_signal(signal[:500])
+    np.testing.assert_allclose(modulator.get_modulated_signal(),
+                               _reference(signal[:500], 10000, 48000), atol=1e-9)
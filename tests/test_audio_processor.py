@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: test_audio_processor.py
+Author: Thimira Hirushan
+Date: 2025-07-21
+Description: Tests for the AudioProcessor class and its resampling helpers.
+Version: 1.0
+"""
+
+import av
+import numpy as np
+import pytest
+import scipy.signal
+from scipy.io import wavfile
+
+from src.modules import audio_processor
+from src.modules._kernels import CARRIER_RESYNC, fused_preemph_am
+from src.modules.audio_processor import AudioProcessor
+
+def _write_stereo_wav(path, sample_rate=44100, peak=14000, seconds=0.5):
+    """
+    Write a two-channel int16 sine test file and return its samples.
+    """
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    left = peak * np.sin(2 * np.pi * 440 * t)
+    right = peak * np.sin(2 * np.pi * 660 * t)
+    samples = np.stack([left, right], axis=1).astype(np.int16)
+    wavfile.write(path, sample_rate, samples)
+    return samples
+
+def test_wav_round_trip_keeps_int16_scale(tmp_path):
+    input_path = str(tmp_path / 'input.wav')
+    output_path = str(tmp_path / 'output.wav')
+    samples = _write_stereo_wav(input_path)
+
+    processor = AudioProcessor(input_path)
+    processor.load_audio(input_path)
+    processor.monotone()
+    processor.oversample(220500)
+    processor.save_audio(output_path)
+
+    sample_rate, written = wavfile.read(output_path)
+    expected_peak = np.max(np.abs(samples.mean(axis=1)))
+    assert sample_rate == 220500
+    assert written.dtype == np.int16
+    assert len(written) == 5 * len(samples)
+    assert np.count_nonzero(np.abs(written.astype(np.int32)) >= 32767) == 0
+    assert abs(np.max(np.abs(written.astype(np.int32))) - expected_peak) < 0.05 * expected_peak
+
+def test_wav_round_trip_scales_normalized_data(tmp_path):
+    input_path = str(tmp_path / 'input.wav')
+    output_path = str(tmp_path / 'output.wav')
+    _write_stereo_wav(input_path)
+
+    processor = AudioProcessor(input_path)
+    processor.load_audio(input_path)
+    processor.monotone()
+    processor.normalize_data()
+    processor.save_audio(output_path)
+
+    _, written = wavfile.read(output_path)
+    assert np.max(np.abs(written.astype(np.int32))) == 32767
+    np.testing.assert_allclose(written / 32767, processor.audio_data, atol=1 / 32767)
+
+def test_mp3_round_trip_matches_wav_scale(tmp_path):
+    wav_path = str(tmp_path / 'input.wav')
+    mp3_path = str(tmp_path / 'output.mp3')
+    _write_stereo_wav(wav_path)
+
+    processor = AudioProcessor(wav_path)
+    processor.load_audio(wav_path)
+    processor.monotone()
+    wav_peak = np.max(np.abs(processor.audio_data))
+    processor.save_audio(mp3_path)
+
+    processor.load_audio(mp3_path)
+    assert processor.sample_rate == 44100
+    assert processor.audio_data.ndim == 1
+    assert abs(np.max(np.abs(processor.audio_data)) - wav_peak) < 0.05 * wav_peak
+
+def test_oversample_accepts_whole_float_rates():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.zeros(441, dtype=np.float32)
+    processor.sample_rate = 44100
+    processor.oversample(220500.0)
+    assert processor.sample_rate == 220500
+    assert len(processor.audio_data) == 5 * 441
+
+def test_oversample_rejects_fractional_rates():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.zeros(441, dtype=np.float32)
+    processor.sample_rate = 44100
+    with pytest.raises(ValueError):
+        processor.oversample(220500.5)
+
+def test_normalize_handles_int16_minimum():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.array([-32768, 100, 50], dtype=np.int16)
+    processor.normalize_data()
+    assert processor.audio_data.dtype == np.float32
+    np.testing.assert_allclose(processor.audio_data, [-1.0, 100 / 32768, 50 / 32768])
+
+def test_pre_emphasis_clears_normalized_flag_but_keeps_unit_scale():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.array([1.0, -1.0, 1.0, -1.0], dtype=np.float32)
+    processor.normalize_data()
+    assert processor.normalized and processor.unit_scale
+    processor.pre_emphasize(normalize=True)
+    assert not processor.normalized
+    assert processor.unit_scale
+    np.testing.assert_allclose(processor.audio_data, [1.0, -1.97, 1.97, -1.97], rtol=1e-6)
+
+    # A second normalizing pass scales again instead of trusting a stale flag
+    processor.pre_emphasize(alpha=0.0, normalize=True)
+    assert np.isclose(np.max(np.abs(processor.audio_data)), 1.0)
+
+def test_pre_emphasis_normalize_sets_unit_scale():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.array([0, 8000, -16000, 4000], dtype=np.int16)
+    assert not processor.unit_scale
+    processor.pre_emphasize(normalize=True)
+    assert processor.unit_scale and not processor.normalized
+
+def test_oversample_clears_normalized_flag_but_keeps_unit_scale():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.sign(np.random.default_rng(5).standard_normal(441)).astype(np.float32)
+    processor.sample_rate = 44100
+    processor.normalize_data()
+    processor.oversample(192000)
+    assert not processor.normalized
+    assert processor.unit_scale
+
+def test_process_fused_clears_normalized_flag():
+    processor = AudioProcessor(None)
+    processor.audio_data = np.linspace(-1.0, 1.0, 64, dtype=np.float32)
+    processor.sample_rate = 192000
+    processor.normalize_data()
+    processor.process_fused(0.97, 40000)
+    assert not processor.normalized
+    assert processor.unit_scale
+
+@pytest.mark.parametrize('block_size', [1, 37, 4096, 1 << 18])
+@pytest.mark.parametrize('up, down', [(5, 1), (4, 1), (160, 147), (640, 147), (7, 3)])
+def test_polyphase_resample_matches_resample_poly(monkeypatch, block_size, up, down):
+    monkeypatch.setattr(audio_processor, 'RESAMPLE_BLOCK_SIZE', block_size)
+    samples = np.random.default_rng(0).standard_normal(2000).astype(np.float32)
+    resampled = audio_processor._polyphase_resample(samples, up, down)
+    expected = scipy.signal.resample_poly(samples, up, down)
+    assert resampled.shape == expected.shape
+    np.testing.assert_allclose(resampled, expected, atol=1e-5)
+
+def test_fused_preemph_am_matches_reference_across_resync_blocks():
+    num_samples = 3 * CARRIER_RESYNC + 123
+    samples = np.random.default_rng(1).standard_normal(num_samples)
+    omega = 2 * np.pi * 40000 / 192000
+    out = np.empty_like(samples)
+    fused_preemph_am(samples, 0.97, omega, 0.5, out)
+    emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+    expected = 0.5 * emphasized * np.cos(omega * np.arange(num_samples))
+    np.testing.assert_allclose(out, expected, atol=1e-9)
+
+def test_process_fused_matches_separate_stages():
+    samples = (np.random.default_rng(2).standard_normal(2 * CARRIER_RESYNC + 5) * 8000).astype(np.int16)
+
+    fused = AudioProcessor(None)
+    fused.audio_data = samples.copy()
+    fused.sample_rate = 192000
+    fused.process_fused(0.97, 40000)
+
+    staged = AudioProcessor(None)
+    staged.audio_data = samples.copy()
+    staged.sample_rate = 192000
+    staged.normalize_data()
+    staged.pre_emphasize(0.97)
+    expected = staged.audio_data * np.cos(2 * np.pi * 40000 / 192000 * np.arange(len(samples)))
+    np.testing.assert_allclose(fused.audio_data, expected, atol=1e-5)
+
+@pytest.mark.skipif(not audio_processor._has_gpu(), reason="requires CuPy and a CUDA device")
+@pytest.mark.parametrize('up, down', [(5, 1), (160, 147), (7, 3)])
+def test_gpu_resample_matches_cpu_path(up, down):
+    samples = np.random.default_rng(3).standard_normal(100000).astype(np.float32)
+    np.testing.assert_allclose(audio_processor._gpu_resample(samples, up, down),
+                               audio_processor._polyphase_resample(samples, up, down), atol=1e-4)
+
+def test_oversample_falls_back_to_cpu_when_gpu_fails(monkeypatch):
+    def out_of_memory(*args, **kwargs):
+        raise MemoryError("out of device memory")
+    monkeypatch.setattr(audio_processor, '_has_gpu', lambda: True)
+    monkeypatch.setattr(audio_processor, 'GPU_RESAMPLE_THRESHOLD', 0)
+    monkeypatch.setattr(audio_processor, 'cp', np)
+    monkeypatch.setattr(audio_processor, '_gpu_resample_poly', out_of_memory, raising=False)
+
+    samples = np.random.default_rng(4).standard_normal(441).astype(np.float32)
+    processor = AudioProcessor(None)
+    processor.audio_data = samples.copy()
+    processor.sample_rate = 44100
+    processor.oversample(220500)
+    np.testing.assert_allclose(processor.audio_data,
+                               audio_processor._polyphase_resample(samples, 5, 1))
+
+def test_wav_round_trip_of_normalized_pre_emphasized_noise(tmp_path):
+    input_path = str(tmp_path / 'noise.wav')
+    output_path = str(tmp_path / 'output.wav')
+    noise = np.random.default_rng(6).standard_normal((22050, 2)) * 5000
+    wavfile.write(input_path, 44100, np.clip(noise, -32768, 32767).astype(np.int16))
+
+    processor = AudioProcessor(input_path)
+    processor.load_audio(input_path)
+    processor.monotone()
+    processor.normalize_data()
+    processor.pre_emphasize()
+    processor.oversample(192000)
+    assert np.max(np.abs(processor.audio_data)) > 1.0
+    processor.save_audio(output_path)
+
+    _, written = wavfile.read(output_path)
+    expected = np.rint(np.clip(processor.audio_data, -1.0, 1.0) * 32767)
+    np.testing.assert_array_equal(written, expected.astype(np.int16))
+    assert np.max(np.abs(written.astype(np.int32))) == 32767
+
+def test_wav_round_trip_does_not_amplify_quiet_int16_data(tmp_path):
+    input_path = str(tmp_path / 'quiet.wav')
+    output_path = str(tmp_path / 'output.wav')
+    wavfile.write(input_path, 44100, np.array([0, 1, -1, 1, 0, -1] * 100, dtype=np.int16))
+
+    processor = AudioProcessor(input_path)
+    processor.load_audio(input_path)
+    processor.monotone()
+    processor.save_audio(output_path)
+
+    _, written = wavfile.read(output_path)
+    assert np.max(np.abs(written.astype(np.int32))) == 1
+
+def test_wav_round_trip_keeps_stereo_layout(tmp_path):
+    input_path = str(tmp_path / 'stereo.wav')
+    output_path = str(tmp_path / 'output.wav')
+    samples = _write_stereo_wav(input_path)
+
+    processor = AudioProcessor(input_path)
+    processor.load_audio(input_path)
+    processor.save_audio(output_path)
+
+    _, written = wavfile.read(output_path)
+    np.testing.assert_array_equal(written, samples)
+
+def test_mp3_save_resamples_unsupported_rates(tmp_path):
+    mp3_path = str(tmp_path / 'output.mp3')
+    processor = AudioProcessor(None)
+    t = np.arange(19200) / 192000
+    processor.audio_data = (0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+    processor.sample_rate = 192000
+    processor.unit_scale = True
+    processor.save_audio(mp3_path)
+
+    processor.load_audio(mp3_path)
+    assert processor.sample_rate == 48000
+    assert abs(len(processor.audio_data) - 4800) < 1152
+    assert abs(np.max(np.abs(processor.audio_data)) - 0.5 * 32767) < 0.05 * 32767
+
+def test_mp3_save_keeps_stereo_channels(tmp_path):
+    mp3_path = str(tmp_path / 'output.mp3')
+    processor = AudioProcessor(None)
+    t = np.arange(44100) / 44100
+    left = 0.5 * np.sin(2 * np.pi * 440 * t)
+    processor.audio_data = np.stack([left, np.zeros_like(left)], axis=1).astype(np.float32)
+    processor.sample_rate = 44100
+    processor.unit_scale = True
+    processor.save_audio(mp3_path)
+
+    with av.open(mp3_path) as container:
+        stream = container.streams.audio[0]
+        assert len(stream.codec_context.layout.channels) == 2
+        decoded = np.concatenate([frame.to_ndarray() for frame in container.decode(stream)], axis=1)
+    assert abs(len(decoded[0]) - 44100) < 1152
+    assert np.max(np.abs(decoded[0])) > 0.4
+    assert np.max(np.abs(decoded[1])) < 0.05
+
+def test_mp3_save_rejects_more_than_two_channels(tmp_path):
+    processor = AudioProcessor(None)
+    processor.audio_data = np.zeros((1000, 3), dtype=np.float32)
+    processor.sample_rate = 44100
+    with pytest.raises(ValueError):
+        processor.save_audio(str(tmp_path / 'output.mp3'))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: test_config.py
+Author: Thimira Hirushan
+Date: 2025-07-21
+Description: Tests for the ConfigManager class.
+Version: 1.0
+"""
+
+from src.utils.config import ConfigManager
+
+def _count_saves(config, monkeypatch):
+    """
+    Wrap ConfigManager.save on an instance and return the list recording each call.
+    """
+    calls = []
+    save = config.save
+    def counting_save():
+        calls.append(1)
+        save()
+    monkeypatch.setattr(config, 'save', counting_save)
+    return calls
+
+def test_mutations_save_immediately_outside_batch(tmp_path, monkeypatch):
+    config = ConfigManager(str(tmp_path / 'config.yaml'))
+    calls = _count_saves(config, monkeypatch)
+    config.set('a', 1)
+    config.update({'b': 2})
+    config.delete('a')
+    assert len(calls) == 3
+    assert ConfigManager(config.config_file).config == {'b': 2}
+
+def test_batch_writes_file_once(tmp_path, monkeypatch):
+    config = ConfigManager(str(tmp_path / 'config.yaml'))
+    calls = _count_saves(config, monkeypatch)
+    with config.batch():
+        for i in range(50):
+            config.set(f'key{i}', i)
+        with config.batch():
+            config.delete('key0')
+        assert calls == []
+    assert len(calls) == 1
+    reloaded = ConfigManager(config.config_file)
+    assert len(reloaded.keys()) == 49
+    assert reloaded.get('key49') == 49
+
+def test_batch_without_changes_does_not_write(tmp_path):
+    config = ConfigManager(str(tmp_path / 'config.yaml'))
+    with config.batch():
+        config.get('missing')
+    assert not config.exists()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Filename: test_dac_interface.py
+Author: Thimira Hirushan
+Date: 2025-07-21
+Description: Tests for the DacInterface class, using a recording stand-in for the output stream.
+Version: 1.0
+"""
+
+import numpy as np
+import pytest
+
+from src.modules import dac_interface
+from src.modules.dac_interface import DacInterface
+
+class _RecordingStream:
+    """
+    Records the calls DacInterface makes on a sounddevice output stream.
+    """
+
+    instances = []
+
+    def __init__(self, samplerate, device, channels, dtype):
+        self.samplerate = samplerate
+        self.device = device
+        self.channels = channels
+        self.dtype = dtype
+        self.written = []
+        self.started = False
+        self.stopped = False
+        self.closed = False
+        _RecordingStream.instances.append(self)
+
+    def start(self):
+        self.started = True
+
+    def write(self, data):
+        assert data.shape[1] == self.channels
+        self.written.append(data.copy())
+
+    def stop(self):
+        self.stopped = True
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def streams(monkeypatch):
+    _RecordingStream.instances = []
+    monkeypatch.setattr(dac_interface.sd, 'OutputStream', _RecordingStream)
+    return _RecordingStream.instances
+
+def test_stream_is_opened_once_and_reused(streams):
+    with DacInterface(sample_rate=48000) as dac:
+        dac.output_audio(np.zeros(256, dtype=np.float32))
+        dac.output_audio(np.ones(256, dtype=np.float64))
+    assert len(streams) == 1
+    stream = streams[0]
+    assert stream.started and stream.stopped and stream.closed
+    assert [chunk.shape for chunk in stream.written] == [(256, 1), (256, 1)]
+    assert stream.written[1].dtype == np.float32
+
+def test_multichannel_data_keeps_its_channels(streams):
+    with DacInterface() as dac:
+        dac.output_audio(np.zeros((128, 2), dtype=np.float32))
+    assert streams[0].channels == 2
+    assert streams[0].written[0].shape == (128, 2)
+
+def test_stream_reopens_on_sample_rate_change(streams):
+    with DacInterface(sample_rate=44100) as dac:
+        dac.output_audio(np.zeros(64, dtype=np.float32))
+        dac.sample_rate = 192000
+        dac.output_audio(np.zeros(64, dtype=np.float32))
+    assert [stream.samplerate for stream in streams] == [44100, 192000]
+    assert streams[0].closed
+
+def test_rejects_data_with_more_than_two_dimensions(streams):
+    with DacInterface() as dac:
+        with pytest.raises(ValueError):
+            dac.output_audio(np.zeros((4, 2, 2), dtype=np.float32))